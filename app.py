@@ -3,10 +3,27 @@ Docker Container Resource Usage Dashboard
 A Streamlit app for monitoring Docker container resource usage.
 """
 import streamlit as st
+import atexit
+import logging
+import os
 import time
 import pandas as pd
+import pyarrow as pa
 from docker_stats import DockerStats
-from dashboard import container_list, metrics, charts
+from dashboard import container_list, metrics, charts, history
+
+# Arrow type of the list-valued columns (ports, volumes) in the container list
+ARROW_STRING_LIST = pd.ArrowDtype(pa.list_(pa.string()))
+
+# Container list columns not left to Arrow inference: list-valued ones, and
+# low-cardinality strings stored as categories
+CONTAINER_DTYPES = {
+    'ports': ARROW_STRING_LIST,
+    'volumes': ARROW_STRING_LIST,
+    'status': 'category',
+    'health': 'category',
+    'image': 'category',
+}
 
 # Page config
 st.set_page_config(
@@ -16,10 +33,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state for storing container history
-if 'container_histories' not in st.session_state:
-    st.session_state.container_histories = {}  # Dict to store history by container ID
-
 if 'last_refresh' not in st.session_state:
     st.session_state.last_refresh = time.time()
 
@@ -30,6 +43,59 @@ def get_docker_stats():
 
 docker_stats = get_docker_stats()
 
+# Container histories, shared by all sessions and memory-mapped from
+# WHALESIGHT_HISTORY_DIR when set so they survive server restarts
+@st.cache_resource
+def get_history_store():
+    return history.HistoryStore(os.environ.get('WHALESIGHT_HISTORY_DIR'))
+
+container_histories = get_history_store()
+
+# Archive of every stats snapshot when WHALESIGHT_SNAPSHOT_DIR is set, shared by all
+# sessions; snapshots still buffered are written out when the server exits
+@st.cache_resource
+def get_snapshot_archive():
+    snapshot_dir = os.environ.get('WHALESIGHT_SNAPSHOT_DIR')
+    if not snapshot_dir:
+        return None
+    archive = history.SnapshotArchive(snapshot_dir)
+    atexit.register(archive.flush)
+    return archive
+
+snapshot_archive = get_snapshot_archive()
+
+# Length of the window in which refreshing sessions share a single Docker query
+DATA_WINDOW_SECONDS = 2
+
+def current_data_window() -> int:
+    return int(time.time() // DATA_WINDOW_SECONDS)
+
+# Cache Docker queries per refresh window: sessions refreshing within the same window
+# share one fetch, and widget-only reruns reuse their session's last window without
+# hitting the daemon; the TTL matches the longest refresh interval
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def load_docker_data(window: int):
+    # List containers once and collect stats for that same list; the list frame is
+    # Arrow-backed so ports/volumes are list<string> arrays instead of Python objects,
+    # with categorical status, health and image
+    containers = docker_stats.get_containers()
+    containers_df = pd.DataFrame(containers).convert_dtypes(dtype_backend='pyarrow')
+    if not containers_df.empty:
+        containers_df = containers_df.astype(CONTAINER_DTYPES)
+    all_stats_df = docker_stats.get_all_container_stats(containers)
+    
+    # Archive each window's stats once, for all sessions; a failing archive must not
+    # take the dashboard down with it
+    if snapshot_archive is not None:
+        try:
+            snapshot_archive.append(all_stats_df)
+        except OSError as e:
+            logging.getLogger(__name__).warning("Error archiving stats snapshot: %s", e)
+    return containers_df, all_stats_df
+
+if 'data_window' not in st.session_state:
+    st.session_state.data_window = current_data_window()
+
 # Dashboard title
 st.title("🐳 Docker Container Resource Dashboard")
 
@@ -52,44 +118,34 @@ refresh_interval = st.sidebar.slider(
 # Refresh button
 refresh = st.sidebar.button("Refresh Now")
 
-# Max history data points to keep
+# Max history data points to show; the shared histories always keep history.HISTORY_CAPACITY
 history_limit = st.sidebar.slider(
     "History Data Points",
     min_value=10,
-    max_value=500,
+    max_value=history.HISTORY_CAPACITY,
     value=100
 )
 
 # Auto-refresh logic
 if (time.time() - st.session_state.last_refresh) > refresh_interval or refresh:
     with st.spinner("Fetching container stats..."):
-        # Get all container stats
-        all_stats_df = docker_stats.get_all_container_stats()
+        st.session_state.data_window = current_data_window()
+        
+        # Get container list and all container stats
+        containers_df, all_stats_df = load_docker_data(st.session_state.data_window)
         
         # Update container histories
-        for _, row in all_stats_df.iterrows():
-            container_id = row['id']
-            container_stats = row.to_dict()
-            
-            # Initialize history for new containers
-            if container_id not in st.session_state.container_histories:
-                st.session_state.container_histories[container_id] = []
-                
-            # Add current stats to history
-            st.session_state.container_histories[container_id].append(container_stats)
-            
-            # Limit history size
-            if len(st.session_state.container_histories[container_id]) > history_limit:
-                st.session_state.container_histories[container_id] = st.session_state.container_histories[container_id][-history_limit:]
+        container_histories.update(all_stats_df)
+        
+        # Drop histories of removed containers so the shared store doesn't grow without bound;
+        # an empty listing may just be a failed query, so keep everything then
+        if not containers_df.empty:
+            container_histories.prune(containers_df['id'])
         
         st.session_state.last_refresh = time.time()
-    
-    # Get container list for selection
-    containers_df = pd.DataFrame(docker_stats.get_containers())
 else:
-    # Use cached container list if not refreshing
-    containers_df = pd.DataFrame(docker_stats.get_containers())
-    all_stats_df = docker_stats.get_all_container_stats()
+    # Use cached container list and stats if not refreshing
+    containers_df, all_stats_df = load_docker_data(st.session_state.data_window)
 
 # Display system overview metrics
 if 'all_stats_df' in locals() and not all_stats_df.empty:
@@ -108,9 +164,15 @@ if not containers_df.empty:
         st.markdown("---")
         
         # Display detailed metrics for selected container
-        if selected_container_id in st.session_state.container_histories:
-            container_history = st.session_state.container_histories[selected_container_id]
-            latest_stats = container_history[-1] if container_history else {}
+        if selected_container_id in container_histories:
+            container_history = container_histories.get(selected_container_id).to_array()[-history_limit:]
+            
+            # The stats frame has no columns at all when no container is running
+            latest_stats = {}
+            if 'id' in all_stats_df:
+                selected_stats_df = all_stats_df[all_stats_df['id'] == selected_container_id]
+                if not selected_stats_df.empty:
+                    latest_stats = selected_stats_df.iloc[0].to_dict()
             
             metrics.display_container_metrics(latest_stats, container_history)
             charts.create_resource_usage_charts(container_history)
@@ -3,4 +3,5 @@ Docker Dashboard package initialization.
 """
 from . import container_list
 from . import metrics
-from . import charts
\ No newline at end of file
+from . import charts
+from . import history
@@ -3,66 +3,167 @@ Charts component for the Docker Dashboard.
 """
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from typing import List, Dict, Any
-import time
+from plotly.subplots import make_subplots
+import numpy as np
+from .history import HISTORY_CAPACITY
 
-def create_resource_usage_charts(history: List[Dict[str, Any]]):
+# Upper bound on points sent to the browser per line trace; histories longer than
+# half the capacity are thinned, keeping their peaks
+MAX_CHART_POINTS = HISTORY_CAPACITY // 2
+
+def downsample_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
     """
-    Create CPU and memory usage charts for a specific container.
+    Pick the indices of points to plot using Largest-Triangle-Three-Buckets.
     
     Args:
-        history: List of historical stats dictionaries for the container
+        x: Numeric x values, sorted ascending
+        y: Y values matching x
+        n_out: Number of points to keep
     """
-    if not history:
-        st.info("Waiting for data to display charts...")
-        return
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
     
-    # Convert history to DataFrame
-    df = pd.DataFrame(history)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
     
-    # Convert timestamp to datetime for better x-axis
-    df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
+    # First and last points are always kept, the rest are split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
     
-    # Create CPU usage chart
-    cpu_fig = px.line(
-        df, 
-        x='datetime', 
-        y='cpu_percent',
-        title='CPU Usage Over Time',
-        labels={'cpu_percent': 'CPU Usage (%)', 'datetime': 'Time'}
-    )
-    cpu_fig.update_layout(
-        height=300,
-        margin=dict(l=20, r=20, t=40, b=20),
-        hovermode="x unified"
-    )
-    cpu_fig.update_yaxes(range=[0, max(100, df['cpu_percent'].max() * 1.1)])
-    st.plotly_chart(cpu_fig, use_container_width=True)
-    
-    # Create memory usage chart
-    mem_fig = px.line(
-        df, 
-        x='datetime', 
-        y=['mem_usage', 'mem_limit'],
-        title='Memory Usage Over Time',
-        labels={'value': 'Memory (MB)', 'datetime': 'Time', 'variable': 'Metric'},
-        color_discrete_map={'mem_usage': 'blue', 'mem_limit': 'red'}
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        
+        # Average point of the next bucket (the last point for the final bucket)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick and the average
+        areas = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected]) -
+            (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(areas.argmax())
+        indices[i + 1] = selected
+    
+    return indices
+
+def to_datetimes(timestamps: np.ndarray) -> np.ndarray:
+    """Convert POSIX timestamps in seconds to datetime64 values for a time x-axis."""
+    return (timestamps * 1e3).astype('datetime64[ms]')
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_history_figure(history: np.ndarray) -> go.Figure:
+    """Build the CPU and memory usage line charts for a container history as one figure."""
+    # Downsample long histories so the payload is bounded by chart width, not history size
+    cpu_points = mem_points = history
+    if len(history) > MAX_CHART_POINTS:
+        cpu_points = history[downsample_lttb(history['timestamp'], history['cpu_percent'], MAX_CHART_POINTS)]
+        mem_points = history[downsample_lttb(history['timestamp'], history['mem_usage'], MAX_CHART_POINTS)]
+    
+    fig = make_subplots(
+        rows=2,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.1,
+        subplot_titles=('CPU Usage Over Time', 'Memory Usage Over Time')
     )
-    mem_fig.update_layout(
-        height=300,
+    
+    # CPU usage chart
+    fig.add_trace(go.Scattergl(
+        x=to_datetimes(cpu_points['timestamp']),
+        y=cpu_points['cpu_percent'],
+        mode='lines',
+        name='CPU Usage (%)'
+    ), row=1, col=1)
+    fig.update_yaxes(title_text='CPU Usage (%)', range=[0, max(100, history['cpu_percent'].max() * 1.1)], row=1, col=1)
+    
+    # Memory usage chart
+    mem_datetimes = to_datetimes(mem_points['timestamp'])
+    fig.add_trace(go.Scattergl(
+        x=mem_datetimes, y=mem_points['mem_usage'], mode='lines', name='mem_usage', line=dict(color='blue')
+    ), row=2, col=1)
+    fig.add_trace(go.Scattergl(
+        x=mem_datetimes, y=mem_points['mem_limit'], mode='lines', name='mem_limit', line=dict(color='red')
+    ), row=2, col=1)
+    fig.update_yaxes(title_text='Memory (MB)', row=2, col=1)
+    fig.update_xaxes(title_text='Time', row=2, col=1)
+    
+    fig.update_layout(
+        height=600,
         margin=dict(l=20, r=20, t=40, b=20),
         hovermode="x unified",
+        legend_title_text='Metric',
         legend=dict(
             orientation="h",
             yanchor="bottom",
-            y=1.02,
+            y=1.04,
             xanchor="right",
             x=1
         )
     )
-    st.plotly_chart(mem_fig, use_container_width=True)
+    return fig
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_system_figure(stats_df: pd.DataFrame) -> go.Figure:
+    """Build the per-container CPU and memory bar charts as one figure."""
+    fig = make_subplots(
+        rows=2,
+        cols=1,
+        vertical_spacing=0.3,
+        subplot_titles=('CPU Usage by Container', 'Memory Usage by Container (% of Limit)')
+    )
+    names = stats_df['name'].astype(str)
+    
+    # CPU usage comparison chart
+    fig.add_trace(go.Bar(
+        x=names,
+        y=stats_df['cpu_percent'],
+        name='CPU Usage (%)',
+        marker=dict(color=stats_df['cpu_percent'], coloraxis='coloraxis')
+    ), row=1, col=1)
+    fig.update_yaxes(title_text='CPU Usage (%)', row=1, col=1)
+    
+    # Memory usage comparison chart
+    fig.add_trace(go.Bar(
+        x=names,
+        y=stats_df['mem_percent'],
+        name='Memory Usage (%)',
+        marker=dict(color=stats_df['mem_percent'], coloraxis='coloraxis2')
+    ), row=2, col=1)
+    fig.update_yaxes(title_text='Memory Usage (%)', row=2, col=1)
+    
+    fig.update_xaxes(title_text='Container', tickangle=45)
+    fig.update_layout(
+        height=700,
+        margin=dict(l=20, r=20, t=40, b=100),
+        showlegend=False,
+        coloraxis=dict(colorscale='Viridis', colorbar=dict(title='CPU %', y=0.82, len=0.4)),
+        coloraxis2=dict(colorscale='Viridis', colorbar=dict(title='Memory %', y=0.18, len=0.4))
+    )
+    return fig
+
+def create_resource_usage_charts(history: np.ndarray):
+    """
+    Create CPU and memory usage charts for a specific container.
+    
+    Both charts share one figure and x-axis. It is cached on the history
+    contents, so reruns that don't add samples (tab switches, filter typing)
+    reuse it.
+    
+    Args:
+        history: Structured array of historical stats for the container, oldest first
+    """
+    if len(history) == 0:
+        st.info("Waiting for data to display charts...")
+        return
+    
+    st.plotly_chart(_build_history_figure(history), use_container_width=True)
 
 def create_system_overview_chart(stats_df: pd.DataFrame):
     """
@@ -74,38 +175,5 @@ def create_system_overview_chart(stats_df: pd.DataFrame):
     if stats_df.empty:
         return
     
-    # Create CPU usage comparison chart
-    cpu_fig = px.bar(
-        stats_df,
-        x='name',
-        y='cpu_percent',
-        title='CPU Usage by Container',
-        labels={'cpu_percent': 'CPU Usage (%)', 'name': 'Container'},
-        color='cpu_percent',
-        color_continuous_scale='Viridis'
-    )
-    cpu_fig.update_layout(
-        height=350,
-        margin=dict(l=20, r=20, t=40, b=100),
-        coloraxis_colorbar=dict(title='CPU %')
-    )
-    cpu_fig.update_xaxes(tickangle=45)
-    st.plotly_chart(cpu_fig, use_container_width=True)
-    
-    # Create memory usage comparison chart
-    mem_fig = px.bar(
-        stats_df,
-        x='name',
-        y='mem_percent',
-        title='Memory Usage by Container (% of Limit)',
-        labels={'mem_percent': 'Memory Usage (%)', 'name': 'Container'},
-        color='mem_percent',
-        color_continuous_scale='Viridis'
-    )
-    mem_fig.update_layout(
-        height=350,
-        margin=dict(l=20, r=20, t=40, b=100),
-        coloraxis_colorbar=dict(title='Memory %')
-    )
-    mem_fig.update_xaxes(tickangle=45)
-    st.plotly_chart(mem_fig, use_container_width=True)
\ No newline at end of file
+    fig = _build_system_figure(stats_df[['name', 'cpu_percent', 'mem_percent']])
+    st.plotly_chart(fig, use_container_width=True)
@@ -16,9 +16,20 @@ def display_container_list(containers_df: pd.DataFrame):
         st.warning("No containers found")
         return None
     
+    # Lowercase search key built once per rerun, so filtering is a literal substring match
+    containers_df = containers_df.assign(
+        _search=(containers_df['name'].str.lower() + '\x00' + containers_df['image'].str.lower()).astype('string[pyarrow]')
+    )
+    
+    # Split containers by status once, for both the summary counts and the tab bodies
+    groups = dict(tuple(containers_df.groupby('status', sort=False, observed=True)))
+    no_containers = containers_df.iloc[0:0]
+    running_containers = groups.get('running', no_containers)
+    stopped_containers = groups.get('exited', no_containers)
+    
     # Container status summary
-    running_count = len(containers_df[containers_df['status'] == 'running'])
-    stopped_count = len(containers_df[containers_df['status'] == 'exited'])
+    running_count = len(running_containers)
+    stopped_count = len(stopped_containers)
     other_count = len(containers_df) - running_count - stopped_count
     
     # Display container counts by status
@@ -38,32 +49,31 @@ def display_container_list(containers_df: pd.DataFrame):
     tab1, tab2, tab3 = st.tabs(["All Containers", "Running Only", "Stopped Only"])
     
     with tab1:
-        filtered_containers = containers_df
-        display_filtered_containers(filtered_containers, "all")
+        display_filtered_containers(containers_df, "all")
     
     with tab2:
-        running_containers = containers_df[containers_df['status'] == 'running']
         display_filtered_containers(running_containers, "running")
     
     with tab3:
-        stopped_containers = containers_df[containers_df['status'] == 'exited']
         display_filtered_containers(stopped_containers, "stopped")
     
     # Return the selected container ID from the active tab
     selected_container_id = st.session_state.get('selected_container_id', None)
     return selected_container_id
 
+@st.fragment
 def display_filtered_containers(filtered_df: pd.DataFrame, status_type: str):
-    """Display containers of a specific status type with filtering options."""
+    """
+    Display containers of a specific status type with filtering options.
+    
+    Runs as a fragment, so typing in one tab's filter box only reruns that tab.
+    """
     # Add a search box for filtering containers
     search_term = st.text_input(f"Filter {status_type} containers", "", key=f"search_{status_type}")
     
-    # Filter containers based on search term
+    # Filter containers by name or image based on search term
     if search_term:
-        search_results = filtered_df[
-            filtered_df['name'].str.contains(search_term, case=False) | 
-            filtered_df['image'].str.contains(search_term, case=False)
-        ]
+        search_results = filtered_df[filtered_df['_search'].str.contains(search_term.lower(), regex=False)]
     else:
         search_results = filtered_df
     
@@ -71,8 +81,9 @@ def display_filtered_containers(filtered_df: pd.DataFrame, status_type: str):
         st.info(f"No {status_type} containers match the filter: '{search_term}'")
         return None
     
-    # Create a selection widget
-    container_options = {row['name']: row['id'] for _, row in search_results.iterrows()}
+    # Create a selection widget, mapping each name to its row position
+    container_names = search_results['name'].to_numpy()
+    container_options = dict(zip(container_names, range(len(container_names))))
     
     if container_options:
         selected_container = st.selectbox(
@@ -81,14 +92,22 @@ def display_filtered_containers(filtered_df: pd.DataFrame, status_type: str):
             key=f"select_{status_type}"
         )
         
-        selected_id = container_options[selected_container]
-        # Store the selected ID in session state
-        st.session_state.selected_container_id = selected_id
+        selected_container_data = search_results.iloc[container_options[selected_container]]
+        selected_id = selected_container_data['id']
+        
+        # Store the selected ID in session state when this tab's selection changes,
+        # rerunning the whole app so the detailed view below follows it
+        previous_id = st.session_state.get(f"selected_id_{status_type}")
+        if previous_id != selected_id:
+            st.session_state[f"selected_id_{status_type}"] = selected_id
+            if previous_id is not None:
+                st.session_state.selected_container_id = selected_id
+                st.rerun()
+            elif 'selected_container_id' not in st.session_state:
+                st.session_state.selected_container_id = selected_id
         
         # Display the selected container's detailed info
-        selected_container_df = search_results[search_results['id'] == selected_id]
-        if not selected_container_df.empty:
-            display_container_details(selected_container_df.iloc[0])
+        display_container_details(selected_container_data)
     
     return None
 
@@ -100,52 +119,58 @@ def display_container_details(container_data):
     # Create tabs for different types of container info
     tabs = st.tabs(["Overview", "Configuration", "Volumes & Networks"])
     
-    # Overview tab
+    # Overview tab, sent to the browser as a single table
     with tabs[0]:
-        col1, col2 = st.columns(2)
+        # Status indicator with color
+        status_color = {
+            'running': '🟢',
+            'exited': '🔴',
+            'paused': '🟠',
+            'created': '🔵'
+        }.get(container_data['status'], '⚪')
         
-        with col1:
-            # Status indicator with color
-            status_color = {
-                'running': '🟢',
-                'exited': '🔴',
-                'paused': '🟠',
-                'created': '🔵'
-            }.get(container_data['status'], '⚪')
-            
-            st.markdown(f"**Status:** {status_color} {container_data['status']}")
-            
-            # Health status if available
-            if container_data['health'] != 'N/A':
-                health_color = {
-                    'healthy': '✅',
-                    'unhealthy': '❌',
-                    'starting': '⏳'
-                }.get(container_data['health'], '❓')
-                st.markdown(f"**Health:** {health_color} {container_data['health']}")
-            
-            # Uptime for running containers
-            if container_data['status'] == 'running' and container_data['uptime_human'] != 'N/A':
-                st.markdown(f"**Uptime:** {container_data['uptime_human']}")
-            
-            # Exit code for stopped containers
-            if container_data['status'] == 'exited' and container_data['exit_code'] is not None:
-                exit_status = "Success" if container_data['exit_code'] == 0 else f"Error ({container_data['exit_code']})"
-                st.markdown(f"**Exit Code:** {exit_status}")
-            
-            st.markdown(f"**Restart Count:** {container_data['restart_count']}")
+        overview = [("Status", f"{status_color} {container_data['status']}")]
         
-        with col2:
-            st.markdown(f"**Image:** {container_data['image']}")
-            st.markdown(f"**ID:** {container_data['id']}")
-            st.markdown(f"**Created:** {container_data['created'][:19].replace('T', ' ')}")
+        # Health status if available
+        if container_data['health'] != 'N/A':
+            health_color = {
+                'healthy': '✅',
+                'unhealthy': '❌',
+                'starting': '⏳'
+            }.get(container_data['health'], '❓')
+            overview.append(("Health", f"{health_color} {container_data['health']}"))
+        
+        # Uptime for running containers
+        if container_data['status'] == 'running' and container_data['uptime_human'] != 'N/A':
+            overview.append(("Uptime", container_data['uptime_human']))
+        
+        # Exit code for stopped containers
+        if container_data['status'] == 'exited' and pd.notna(container_data['exit_code']):
+            exit_code = int(container_data['exit_code'])
+            overview.append(("Exit Code", "Success" if exit_code == 0 else f"Error ({exit_code})"))
+        
+        overview += [
+            ("Restart Count", str(container_data['restart_count'])),
+            ("Image", container_data['image']),
+            ("ID", container_data['id']),
+            ("Created", container_data['created'][:19].replace('T', ' '))
+        ]
+        
+        st.dataframe(
+            pd.DataFrame(overview, columns=["Field", "Value"]),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Field": st.column_config.TextColumn("Field", width="small"),
+                "Value": st.column_config.TextColumn("Value")
+            }
+        )
     
     # Configuration tab
     with tabs[1]:
         st.markdown("#### Port Mappings")
         if container_data['ports'] and len(container_data['ports']) > 0:
-            for port in container_data['ports']:
-                st.code(port)
+            st.code("\n".join(container_data['ports']), language="text")
         else:
             st.text("No port mappings")
         
@@ -156,7 +181,6 @@ def display_container_details(container_data):
     with tabs[2]:
         st.markdown("#### Volumes")
         if container_data['volumes'] and len(container_data['volumes']) > 0:
-            for volume in container_data['volumes']:
-                st.code(volume)
+            st.code("\n".join(container_data['volumes']), language="text")
         else:
-            st.text("No volumes mounted")
\ No newline at end of file
+            st.text("No volumes mounted")
@@ -0,0 +1,283 @@
+"""
+History buffer component for the Docker Dashboard.
+Keeps a fixed number of recent stats samples per container in NumPy arrays,
+optionally memory-mapped from disk so they are shared between sessions and
+survive server restarts. Full stats snapshots can also be archived to a
+date-partitioned Parquet dataset for later analysis.
+"""
+import datetime
+import os
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, Iterable, List, Optional
+
+# Columns kept in history, stored as one contiguous array per field
+HISTORY_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('cpu_percent', 'f4'),
+    ('mem_usage', 'f4'),
+    ('mem_limit', 'f4'),
+    ('mem_percent', 'f4'),
+    ('network_rx', 'i8'),
+    ('network_tx', 'i8'),
+    ('block_read', 'i8'),
+    ('block_write', 'i8'),
+])
+
+# Columns of the snapshot archive; every file is written with exactly this schema, so a
+# snapshot missing some columns (only errored containers, say) can't narrow the dataset
+SNAPSHOT_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('name', pa.string()),
+    ('status', pa.string()),
+    ('running', pa.bool_()),
+    ('error', pa.string()),
+    ('cpu_percent', pa.float32()),
+    ('cpu_throttled_periods', pa.uint64()),
+    ('cpu_throttled_time', pa.uint64()),
+    ('cpu_system_percent', pa.float32()),
+    ('mem_usage', pa.float32()),
+    ('mem_limit', pa.float32()),
+    ('mem_percent', pa.float32()),
+    ('mem_cache', pa.float32()),
+    ('mem_swap', pa.float32()),
+    ('oom_kills', pa.uint64()),
+    ('network_rx', pa.uint64()),
+    ('network_tx', pa.uint64()),
+    ('network_rx_dropped', pa.uint64()),
+    ('network_tx_dropped', pa.uint64()),
+    ('network_rx_errors', pa.uint64()),
+    ('network_tx_errors', pa.uint64()),
+    ('block_read', pa.uint64()),
+    ('block_write', pa.uint64()),
+    ('io_time', pa.uint64()),
+    ('io_wait_time', pa.uint64()),
+    ('pids', pa.uint32()),
+    ('timestamp', pa.float64()),
+    ('snapshot_time', pa.timestamp('us', tz='UTC')),
+])
+
+# Samples kept per container, the most history any session can show
+HISTORY_CAPACITY = 500
+
+# Snapshots buffered before they are written out together as one file (5 minutes of 2 s windows)
+SNAPSHOT_BATCH = 150
+
+class ContainerHistory:
+    """Fixed-capacity ring buffer of stats samples for one container."""
+
+    def __init__(self, capacity: int, path: Optional[str] = None):
+        """Preallocate storage for `capacity` samples, memory-mapped from `path` if given."""
+        self.path = path
+        if path is not None and os.path.exists(path):
+            # Reopen a history file from an earlier run and continue where it left off
+            self.buffer = np.memmap(path, dtype=HISTORY_DTYPE, mode='r+')
+            self.head = self._recover_head()
+            self.resize(capacity)
+        else:
+            self.buffer = self._allocate(capacity)
+            self.head = 0  # Total number of samples written so far
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        """Return zeroed storage for `capacity` samples, in memory or backed by the history file."""
+        if self.path is None:
+            return np.zeros(capacity, dtype=HISTORY_DTYPE)
+        return np.memmap(self.path, dtype=HISTORY_DTYPE, mode='w+', shape=(capacity,))
+
+    def _recover_head(self) -> int:
+        """Work out the write position of a reopened buffer from its timestamps."""
+        timestamps = self.buffer['timestamp']
+        filled = int(np.count_nonzero(timestamps))
+        if filled < self.capacity:
+            return filled
+
+        # Full buffer: the next write goes right after the newest sample
+        return self.capacity + (int(timestamps.argmax()) + 1) % self.capacity
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of samples kept."""
+        return len(self.buffer)
+
+    def __len__(self) -> int:
+        return min(self.head, self.capacity)
+
+    @property
+    def latest_timestamp(self) -> float:
+        """Timestamp of the most recent sample, or 0 if empty."""
+        if self.head == 0:
+            return 0.0
+        return float(self.buffer['timestamp'][(self.head - 1) % self.capacity])
+
+    def append(self, sample: np.void):
+        """Write one sample, overwriting the oldest once the buffer is full."""
+        self.buffer[self.head % self.capacity] = sample
+        self.head += 1
+
+    def to_array(self) -> np.ndarray:
+        """Return the stored samples in chronological order."""
+        if self.head <= self.capacity:
+            return self.buffer[:self.head]
+
+        start = self.head % self.capacity
+        return np.concatenate((self.buffer[start:], self.buffer[:start]))
+
+    def resize(self, capacity: int):
+        """Change the capacity, keeping the most recent samples."""
+        if capacity == self.capacity:
+            return
+
+        # Copy out before reallocating, the history file is truncated and rewritten
+        samples = np.array(self.to_array()[-capacity:])
+        del self.buffer
+        self.buffer = self._allocate(capacity)
+        self.buffer[:len(samples)] = samples
+        self.head = len(samples)
+
+def stats_to_samples(stats_df: pd.DataFrame) -> np.ndarray:
+    """
+    Convert a stats DataFrame into an array of history samples, one per row.
+
+    Args:
+        stats_df: DataFrame containing container stats
+    """
+    samples = np.zeros(len(stats_df), dtype=HISTORY_DTYPE)
+    for field in HISTORY_DTYPE.names:
+        if field in stats_df.columns:
+            # Stopped or errored containers have no metrics, store them as zero
+            samples[field] = stats_df[field].fillna(0).to_numpy()
+    return samples
+
+class SnapshotArchive:
+    """Stats snapshots appended in batches to a Parquet dataset with daily partitions."""
+
+    def __init__(self, directory: str, batch_size: int = SNAPSHOT_BATCH):
+        """
+        Create an archive writing under `directory`.
+
+        Args:
+            directory: Root directory of the dataset, readable back with pd.read_parquet(directory)
+            batch_size: Number of snapshots written together as one Parquet file
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self._pending: List[pa.Table] = []
+        self._pending_date: Optional[datetime.date] = None
+        self._lock = threading.Lock()
+
+    def append(self, stats_df: pd.DataFrame):
+        """
+        Add a stats snapshot, writing out the batch once it is full.
+
+        Args:
+            stats_df: DataFrame containing container stats
+        """
+        if stats_df.empty:
+            return
+
+        # Wall-clock capture time, partitioned by UTC date so old days can be dropped as directories
+        taken = datetime.datetime.now(datetime.timezone.utc)
+        snapshot = stats_df.assign(snapshot_time=taken).reindex(columns=SNAPSHOT_SCHEMA.names)
+        table = pa.Table.from_pandas(snapshot, schema=SNAPSHOT_SCHEMA, preserve_index=False)
+
+        with self._lock:
+            # A batch never spans two days' partitions
+            if self._pending and taken.date() != self._pending_date:
+                self._write_pending()
+            self._pending.append(table)
+            self._pending_date = taken.date()
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def flush(self):
+        """Write out any buffered snapshots."""
+        with self._lock:
+            self._write_pending()
+
+    def _write_pending(self):
+        """Write the buffered snapshots as one file, named after the first snapshot's time."""
+        if not self._pending:
+            return
+
+        # Take the batch out first, so a failed write drops it instead of growing it forever
+        tables, self._pending = self._pending, []
+        table = pa.concat_tables(tables)
+        first = table.column('snapshot_time')[0].as_py()
+        partition = os.path.join(self.directory, f"date={self._pending_date:%Y-%m-%d}")
+        os.makedirs(partition, exist_ok=True)
+        pq.write_table(table, os.path.join(partition, f"{first:%H%M%S%f}.parquet"))
+
+class HistoryStore:
+    """Container histories shared by every dashboard session."""
+
+    def __init__(self, directory: Optional[str] = None, capacity: int = HISTORY_CAPACITY):
+        """
+        Create an empty store.
+
+        Args:
+            directory: Directory for memory-mapped history files, or None to keep histories in memory
+            capacity: Samples kept per container; sessions showing fewer read only the newest ones
+        """
+        self.directory = directory
+        self.capacity = capacity
+        self.histories: Dict[str, ContainerHistory] = {}
+        self._lock = threading.Lock()  # Sessions refresh from separate script threads
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __contains__(self, container_id: str) -> bool:
+        return container_id in self.histories
+
+    def get(self, container_id: str) -> Optional[ContainerHistory]:
+        """Return the history of a container, or None if it has no samples yet."""
+        return self.histories.get(container_id)
+
+    def prune(self, container_ids: Iterable[str]):
+        """
+        Forget the histories of containers that are no longer listed.
+
+        Their history files stay on disk and are reopened if the container shows up again.
+
+        Args:
+            container_ids: IDs of every container currently listed
+        """
+        with self._lock:
+            for container_id in set(self.histories) - set(container_ids):
+                # Dropping the last reference unmaps a history file and closes its descriptor
+                del self.histories[container_id]
+
+    def _open(self, container_id: str) -> ContainerHistory:
+        """Create the history of a new container, reopening its file if one exists."""
+        path = None
+        if self.directory is not None:
+            path = os.path.join(self.directory, f"{container_id}.bin")
+        return ContainerHistory(self.capacity, path)
+
+    def update(self, stats_df: pd.DataFrame):
+        """
+        Append the latest stats for every container to its history.
+
+        Args:
+            stats_df: DataFrame containing the latest container stats
+        """
+        if stats_df.empty:
+            return
+
+        samples = stats_to_samples(stats_df)
+        with self._lock:
+            for container_id, sample in zip(stats_df['id'].to_numpy(), samples):
+                history = self.histories.get(container_id)
+
+                # Initialize history for new containers
+                if history is None:
+                    history = self.histories[container_id] = self._open(container_id)
+
+                # Several sessions may refresh from the same cached stats, store each sample once
+                if sample['timestamp'] <= history.latest_timestamp:
+                    continue
+
+                history.append(sample)
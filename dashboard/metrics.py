@@ -4,20 +4,42 @@ Provides comprehensive visualization of container resource usage.
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import time
 import datetime
+from collections import Counter
+from functools import lru_cache
 from typing import Dict, List, Any
 
+# Unit boundaries shared by the scalar and vectorized byte formatters
+_BYTE_THRESHOLDS = np.array([1024, 1024 ** 2, 1024 ** 3], dtype=np.float64)
+_BYTE_DIVISORS = np.array([1, 1024, 1024 ** 2, 1024 ** 3], dtype=np.float64)
+_BYTE_UNITS = np.array([' B', ' KB', ' MB', ' GB'])
+
+# Columns totalled for the summary metrics
+SUMMARY_COLUMNS = ['cpu_percent', 'mem_usage', 'mem_limit', 'network_rx', 'network_tx', 'block_read', 'block_write', 'pids']
+
+@lru_cache(maxsize=4096)
 def format_bytes(bytes_value: int) -> str:
     """Format bytes to human-readable format."""
-    if bytes_value < 1024:
+    # Each unit spans 10 bits, so the unit index comes straight from the bit length
+    unit = min(3, max(int(bytes_value).bit_length() - 1, 0) // 10)
+    if unit == 0:
         return f"{bytes_value} B"
-    elif bytes_value < 1024 * 1024:
-        return f"{bytes_value / 1024:.2f} KB"
-    elif bytes_value < 1024 * 1024 * 1024:
-        return f"{bytes_value / (1024 * 1024):.2f} MB"
-    else:
-        return f"{bytes_value / (1024 * 1024 * 1024):.2f} GB"
+    return f"{bytes_value / (1 << (10 * unit)):.2f}{_BYTE_UNITS[unit]}"
+
+def format_bytes_vec(values) -> np.ndarray:
+    """Format an array of byte counts to human-readable strings in one pass."""
+    values = np.asarray(values, dtype=np.float64)
+    unit = np.searchsorted(_BYTE_THRESHOLDS, values, side='right')
+    
+    # Plain bytes are shown without decimals, larger units with two
+    scaled = np.where(
+        unit == 0,
+        np.char.mod('%d', values.astype(np.int64)),
+        np.char.mod('%.2f', values / _BYTE_DIVISORS[unit])
+    )
+    return np.char.add(scaled, _BYTE_UNITS[unit])
 
 def display_system_overview(system_stats: Dict[str, Any]):
     """
@@ -69,14 +91,19 @@ def display_container_status(containers: List[Dict[str, Any]]):
         st.info("No containers found")
         return
         
-    # Count container statuses
-    running = sum(1 for c in containers if c['status'] == 'running')
-    stopped = sum(1 for c in containers if c['status'] == 'exited')
+    # Count container statuses and health in a single pass
+    status_counts = Counter()
+    health_counts = Counter()
+    for c in containers:
+        status_counts[c['status']] += 1
+        health_counts[c.get('health')] += 1
+    
+    running = status_counts['running']
+    stopped = status_counts['exited']
     other = len(containers) - running - stopped
     
-    # Count container health
-    healthy = sum(1 for c in containers if c.get('health') == 'healthy')
-    unhealthy = sum(1 for c in containers if c.get('health') == 'unhealthy')
+    healthy = health_counts['healthy']
+    unhealthy = health_counts['unhealthy']
     
     st.subheader("Container Status")
     
@@ -116,21 +143,31 @@ def display_summary_metrics(stats_df: pd.DataFrame):
     
     st.subheader("Resource Utilization")
     
-    # Calculate summary metrics
-    total_cpu = stats_df['cpu_percent'].sum()
-    total_mem_usage = stats_df['mem_usage'].sum()
-    total_mem_limit = stats_df['mem_limit'].mean() * len(stats_df)  # Approximate total available
+    # Use the totals precomputed during collection when they cover exactly these rows (a filtered
+    # frame inherits its parent's attrs), or total summary, network and I/O columns in one
+    # reduction over a contiguous float64 block (stopped or errored containers have NaN metrics)
+    totals = stats_df.attrs.get('totals')
+    if totals is None or not stats_df.index.equals(stats_df.attrs.get('totals_index')):
+        totals = dict(zip(SUMMARY_COLUMNS, np.nansum(
+            stats_df.reindex(columns=SUMMARY_COLUMNS).to_numpy(dtype=np.float64, na_value=np.nan),
+            axis=0
+        )))
+    
+    (total_cpu, total_mem_usage, total_mem_limit,
+     total_network_rx, total_network_tx, total_block_read, total_block_write, total_pids) = (
+        totals[column] for column in SUMMARY_COLUMNS
+    )
     
     if total_mem_limit > 0:
         total_mem_percent = (total_mem_usage / total_mem_limit) * 100
     else:
         total_mem_percent = 0
     
-    # Calculate network and I/O totals
-    total_network_rx = stats_df['network_rx'].sum()
-    total_network_tx = stats_df['network_tx'].sum()
-    total_block_read = stats_df['block_read'].sum()
-    total_block_write = stats_df['block_write'].sum()
+    # Format all I/O labels at once
+    network_total, network_rx, network_tx, block_total, block_read, block_write = format_bytes_vec([
+        total_network_rx + total_network_tx, total_network_rx, total_network_tx,
+        total_block_read + total_block_write, total_block_read, total_block_write
+    ])
     
     # Display metrics in columns
     col1, col2, col3 = st.columns(3)
@@ -162,32 +199,31 @@ def display_summary_metrics(stats_df: pd.DataFrame):
     with col1:
         st.metric(
             "Network I/O", 
-            f"{format_bytes(total_network_rx + total_network_tx)}",
-            delta=f"↓{format_bytes(total_network_rx)} ↑{format_bytes(total_network_tx)}"
+            network_total,
+            delta=f"↓{network_rx} ↑{network_tx}"
         )
     
     with col2:
         st.metric(
             "Disk I/O", 
-            f"{format_bytes(total_block_read + total_block_write)}",
-            delta=f"R:{format_bytes(total_block_read)} W:{format_bytes(total_block_write)}"
+            block_total,
+            delta=f"R:{block_read} W:{block_write}"
         )
     
     with col3:
-        total_pids = stats_df['pids'].sum() if 'pids' in stats_df.columns else 0
         st.metric(
             "Processes", 
             f"{int(total_pids)}",
             delta=None
         )
 
-def display_container_metrics(stats: Dict[str, Any], history: List[Dict[str, Any]]):
+def display_container_metrics(stats: Dict[str, Any], history: np.ndarray):
     """
     Display detailed metrics for a specific container.
     
     Args:
         stats: Dictionary containing the latest container stats
-        history: List of historical stats dictionaries for the container
+        history: Structured array of historical stats for the container
     """
     if not stats:
         st.warning("No stats available for this container")
@@ -352,12 +388,12 @@ def display_container_details(container: Dict[str, Any]):
             for volume in container.get('volumes', []):
                 st.code(volume)
 
-def display_container_logs_and_events(logs: List[str], events: List[Dict[str, Any]]):
+def display_container_logs_and_events(logs: str, events: List[Dict[str, Any]]):
     """
     Display container logs and events.
     
     Args:
-        logs: List of log lines
+        logs: Recent log output, one line per log entry
         events: List of event dictionaries
     """
     tab1, tab2 = st.tabs(["Logs", "Events"])
@@ -365,8 +401,7 @@ def display_container_logs_and_events(logs: List[str], events: List[Dict[str, An
     with tab1:
         if logs:
             st.subheader("Container Logs")
-            log_text = "\n".join(logs)
-            st.text_area("Recent logs", log_text, height=300)
+            st.text_area("Recent logs", logs, height=300)
         else:
             st.info("No logs available")
     
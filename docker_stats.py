@@ -7,33 +7,175 @@ This enhanced module collects comprehensive container metrics including:
 - Detailed CPU, memory, network, and storage metrics
 - Container configuration and operational data
 """
+import collections
 import docker
+import glob
+import logging
+import orjson
+import os
+import requests
+import threading
 import time
+import numpy as np
 import pandas as pd
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Any, Tuple, Optional
 
+logger = logging.getLogger(__name__)
+
+# Failures expected from a daemon call: API errors, dropped connections and malformed payloads
+DOCKER_ERRORS = (docker.errors.DockerException, requests.exceptions.RequestException, ValueError, KeyError)
+
+# Root of the unified (v2) cgroup hierarchy on Linux hosts
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Narrow dtypes for the stats DataFrame; counters are nullable since errored containers have no metrics
+STATS_DTYPES = {
+    'id': 'category',
+    'name': 'category',
+    'status': 'category',
+    'running': 'bool',
+    'cpu_percent': 'float32',
+    'cpu_system_percent': 'float32',
+    'mem_usage': 'float32',
+    'mem_limit': 'float32',
+    'mem_percent': 'float32',
+    'mem_cache': 'float32',
+    'mem_swap': 'float32',
+    'network_rx': 'UInt64',
+    'network_tx': 'UInt64',
+    'block_read': 'UInt64',
+    'block_write': 'UInt64',
+    'pids': 'UInt32',
+}
+
+# Memory columns reported in bytes by both stats sources, usage and limit first
+MEMORY_COLUMNS = ('mem_usage', 'mem_limit', 'mem_cache', 'mem_swap')
+
+# Index of each block I/O op in (read, write); the API capitalizes ops on cgroup v1 hosts, not on v2
+BLKIO_OPS = {'Read': 0, 'read': 0, 'Write': 1, 'write': 1}
+
+# /proc/net/dev fields after the interface name: rx/tx bytes, rx/tx drops, rx/tx errors,
+# in the order the stats dictionaries list them
+NET_DEV_COUNTERS = itemgetter(0, 8, 3, 11, 2, 10)
+
+# Most daemon stats requests in flight at once
+STATS_WORKERS = 32
+
+# Seconds after which a streamed stats frame is considered stale; the daemon sends one per second
+STREAM_STALE_SECONDS = 5
+
+# Seconds a container listing is reused before listing again
+CONTAINERS_TTL = 2
+
+# Seconds a system-wide snapshot is reused before querying the daemon again
+SYSTEM_STATS_TTL = 10
+
+# Seconds a successful ping is trusted before the daemon is pinged again
+PING_TTL = 5
+
+# CPU percentage columns, rounded for display once all containers are collected
+CPU_COLUMNS = ('cpu_percent', 'cpu_system_percent')
+
+# Columns totalled across containers, stored in the stats DataFrame's attrs['totals']
+# along with the index of the rows they cover, attrs['totals_index']
+TOTAL_COLUMNS = ('cpu_percent', 'mem_usage', 'mem_limit', 'network_rx', 'network_tx', 'block_read', 'block_write', 'pids')
+
+@lru_cache(maxsize=4096)
+def _format_uptime(seconds: int) -> str:
+    """Format seconds into a human-readable uptime string."""
+    if seconds < 60:
+        return f"{int(seconds)} seconds"
+    
+    minutes = int(seconds) // 60
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    
+    # Show units from the largest nonzero one down to minutes
+    if days:
+        return f"{days}d {hours}h {minutes}m"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
 class DockerStats:
     """Class to collect and process Docker container statistics."""
     
+    # Fixed attribute layout, no per-instance __dict__
+    __slots__ = (
+        'client', 'is_connected', '_executor',
+        '_streams', '_stream_threads', '_stream_stops', '_stream_lock',
+        '_cgroup_v2', '_cgroup_dirs', '_cgroup_prev', '_cgroup_fds', '_net_dev_dirs', '_container_names',
+        '_prev_cpu', '_one_shot', '_online_cpus',
+        '_containers', '_system_stats', '_last_ping',
+    )
+    
     def __init__(self):
         """Initialize Docker client connection."""
         try:
-            self.client = docker.from_env()
+            # Keep an idle keep-alive connection for every stats worker; with docker-py's default of 10,
+            # connections beyond that are closed after each request and reopened on the next refresh
+            self.client = docker.from_env(max_pool_size=STATS_WORKERS)
             self.is_connected = True
-        except Exception as e:
-            print(f"Error connecting to Docker: {e}")
+        except docker.errors.DockerException as e:
+            logger.warning("Error connecting to Docker: %s", e)
             self.is_connected = False
+        
+        # Long-lived workers for stats requests to the daemon, reused across refreshes
+        self._executor = ThreadPoolExecutor(max_workers=STATS_WORKERS, thread_name_prefix='stats')
+        
+        # Latest stats frame per container and when it arrived, kept current by background stream readers
+        self._streams: Dict[str, Tuple[float, bytes]] = {}
+        self._stream_threads: Dict[str, threading.Thread] = {}
+        self._stream_stops: Dict[str, threading.Event] = {}
+        self._stream_lock = threading.Lock()  # Orders a reader's publish against its stream being stopped
+        
+        # Direct cgroup reads, used instead of the API when the host exposes cgroup v2
+        self._cgroup_v2 = os.path.exists(os.path.join(CGROUP_ROOT, 'cgroup.controllers'))
+        self._cgroup_dirs: Dict[str, Optional[str]] = {}
+        self._cgroup_prev: Dict[str, Tuple[int, int, float]] = {}  # (usage_usec, system_usec, time)
+        self._cgroup_fds: Dict[str, int] = {}  # Open descriptors by file path, reused across refreshes
+        self._net_dev_dirs: Dict[str, str] = {}  # /proc/<pid> each container's network counters are read through
+        self._container_names: Dict[str, str] = {}
+        
+        # One-shot API snapshots have no pre-CPU sample, so keep the previous one per container
+        self._prev_cpu: Dict[str, Dict[str, Any]] = {}
+        self._one_shot = self.is_connected and not docker.utils.version_lt(self.client.api.api_version, '1.41')
+        
+        # CPU count for stats frames from daemons too old to report online_cpus themselves
+        self._online_cpus = os.cpu_count() or 1
+        
+        # Last container listings (all, running only) and when they were taken
+        self._containers: Dict[bool, Tuple[float, List[Dict[str, Any]]]] = {}
+        
+        # Last system snapshot and when it was taken
+        self._system_stats: Tuple[float, Dict[str, Any]] = (0.0, {})
+        
+        # When the daemon last answered a ping
+        self._last_ping: Optional[float] = None
     
-    def get_containers(self) -> List[Dict[str, Any]]:
-        """Get list of running containers with enhanced info."""
+    def get_containers(self, running_only: bool = False) -> List[Dict[str, Any]]:
+        """Get list of containers with enhanced info, all of them unless `running_only` is set."""
         if not self.is_connected:
             return []
         
+        # Reuse a listing taken moments ago, back-to-back polls would otherwise inspect every container again
+        cached_at, containers = self._containers.get(running_only, (0.0, None))
+        if containers is not None and time.monotonic() - cached_at < CONTAINERS_TTL:
+            return containers
+        
         containers = []
         try:
-            # Get all containers, not just running ones
-            for container in self.client.containers.list(all=True):
+            # Measure every uptime against the same snapshot time
+            now = datetime.datetime.now(datetime.timezone.utc)
+            
+            # Get all containers, not just running ones, unless the daemon should filter them;
+            # its default listing still includes paused containers, which have no stats to collect
+            filters = {'status': 'running'} if running_only else None
+            for container in self.client.containers.list(all=not running_only, filters=filters):
                 # Calculate uptime for running containers
                 uptime = None
                 restart_count = 0
@@ -43,8 +185,10 @@ class DockerStats:
                 if container.status == "running":
                     start_time = container.attrs.get('State', {}).get('StartedAt')
                     if start_time:
-                        start_time = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                        uptime = (datetime.datetime.now(datetime.timezone.utc) - start_time).total_seconds()
+                        # StartedAt is always UTC; whole seconds are enough for uptime, and the fixed-width
+                        # prefix skips the nanosecond fraction older fromisoformat versions reject
+                        start_time = datetime.datetime.fromisoformat(start_time[:19]).replace(tzinfo=datetime.timezone.utc)
+                        uptime = (now - start_time).total_seconds()
 
                 # Get restart count
                 restart_count = container.attrs.get('RestartCount', 0)
@@ -59,27 +203,31 @@ class DockerStats:
                     exit_code = container.attrs.get('State', {}).get('ExitCode')
                 
                 # Get container info including environment variables and ports
-                ports = container.attrs.get('NetworkSettings', {}).get('Ports', {})
-                port_mappings = []
-                for container_port, host_ports in ports.items() if ports else {}:
-                    if host_ports:
-                        for port_mapping in host_ports:
-                            port_mappings.append(f"{port_mapping['HostIp']}:{port_mapping['HostPort']}->{container_port}")
+                ports = container.attrs.get('NetworkSettings', {}).get('Ports') or {}
+                port_mappings = [
+                    f"{port_mapping['HostIp']}:{port_mapping['HostPort']}->{container_port}"
+                    for container_port, host_ports in ports.items() if host_ports
+                    for port_mapping in host_ports
+                ]
                 
                 # Get volume information
-                volumes = container.attrs.get('Mounts', [])
-                volume_info = []
-                for volume in volumes:
-                    volume_info.append(f"{volume.get('Source')} -> {volume.get('Destination')}")
+                volume_info = [
+                    f"{volume.get('Source')} -> {volume.get('Destination')}"
+                    for volume in container.attrs.get('Mounts') or ()
+                ]
+                
+                # Image reference from the container's own config; container.image would
+                # cost an extra images API request per container
+                image = container.attrs.get('Config', {}).get('Image') or container.attrs.get('Image', '')[:12]
                 
                 containers.append({
                     'id': container.id[:12],  # Short ID
                     'name': container.name,
-                    'image': container.image.tags[0] if container.image.tags else container.image.id[:12],
+                    'image': image,
                     'status': container.status,
                     'health': health_status,
                     'uptime': uptime,
-                    'uptime_human': self._format_uptime(uptime) if uptime else 'N/A',
+                    'uptime_human': _format_uptime(int(uptime)) if uptime else 'N/A',
                     'created': container.attrs['Created'],
                     'restart_count': restart_count,
                     'exit_code': exit_code,
@@ -87,187 +235,78 @@ class DockerStats:
                     'ports': port_mappings,
                     'volumes': volume_info
                 })
-        except Exception as e:
-            print(f"Error getting container list: {e}")
+            
+            self._containers[running_only] = (time.monotonic(), containers)
+        except DOCKER_ERRORS as e:
+            logger.warning("Error getting container list: %s", e)
         
         return containers
-        
-    def _format_uptime(self, seconds: float) -> str:
-        """Format seconds into a human-readable uptime string."""
-        if seconds < 60:
-            return f"{int(seconds)} seconds"
-        
-        minutes, seconds = divmod(int(seconds), 60)
-        hours, minutes = divmod(minutes, 60)
-        days, hours = divmod(hours, 24)
-        
-        parts = []
-        if days > 0:
-            parts.append(f"{days}d")
-        if hours > 0 or days > 0:
-            parts.append(f"{hours}h")
-        if minutes > 0 or hours > 0 or days > 0:
-            parts.append(f"{minutes}m")
-        
-        return " ".join(parts)
     
     def get_container_stats(self, container_id: str) -> Dict[str, Any]:
-        """Get detailed stats for a specific container with enhanced metrics."""
+        """Get detailed stats for a specific container with enhanced metrics.
+        
+        Values are in the same units as get_all_container_stats: memory in MB with mem_percent,
+        CPU percentages rounded to two decimals.
+        """
         if not self.is_connected:
             return {}
         
+        stats = self._collect_container_stats(container_id)
+        if not stats.get('running'):
+            return stats
+        
+        # Same conversion as a whole refresh, applied to single-row columns
+        columns = {key: [value] for key, value in stats.items()}
+        self._finish_columns(columns)
+        return {
+            key: values[0].item() if isinstance(values, np.ndarray) else values[0]
+            for key, values in columns.items()
+        }
+    
+    def _collect_container_stats(self, container_id: str) -> Dict[str, Any]:
+        """Collect one container's stats; the caller has already checked the connection."""
         try:
-            container = self.client.containers.get(container_id)
-            
-            # Skip if container is not running
-            if container.status != "running":
-                return {
-                    'id': container_id,
-                    'name': container.name,
-                    'status': container.status,
-                    'running': False,
-                    'timestamp': time.time()
-                }
-            
-            stats = container.stats(stream=False)  # Get a single stats snapshot
-            
-            # Check if we have valid stats data
-            if not stats or 'cpu_stats' not in stats or 'precpu_stats' not in stats:
-                return {
-                    'id': container_id,
-                    'name': container.name,
-                    'status': 'unknown',
-                    'running': False,
-                    'timestamp': time.time()
-                }
-            
-            # Process CPU stats - add safety checks
-            cpu_delta = 0
-            system_delta = 0
-            
-            if 'cpu_usage' in stats['cpu_stats'] and 'cpu_usage' in stats['precpu_stats'] and \
-               'total_usage' in stats['cpu_stats']['cpu_usage'] and 'total_usage' in stats['precpu_stats']['cpu_usage']:
-                cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - stats['precpu_stats']['cpu_usage']['total_usage']
-            
-            if 'system_cpu_usage' in stats['cpu_stats'] and 'system_cpu_usage' in stats['precpu_stats']:
-                system_delta = stats['cpu_stats']['system_cpu_usage'] - stats['precpu_stats']['system_cpu_usage']
-            
-            online_cpus = stats['cpu_stats'].get('online_cpus', 
-                          len(stats['cpu_stats'].get('cpu_usage', {}).get('percpu_usage', [1])))
-            
-            cpu_percent = 0.0
-            if system_delta > 0 and cpu_delta > 0:
-                cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0
-            
-            # CPU throttling stats
-            cpu_throttled_periods = 0
-            cpu_throttled_time = 0
-            if 'throttling_data' in stats.get('cpu_stats', {}):
-                cpu_throttled_periods = stats['cpu_stats']['throttling_data'].get('throttled_periods', 0)
-                cpu_throttled_time = stats['cpu_stats']['throttling_data'].get('throttled_time', 0)
-            
-            # Process memory stats - add safety checks
-            mem_stats = stats.get('memory_stats', {})
-            mem_usage = mem_stats.get('usage', 0)
-            mem_limit = mem_stats.get('limit', 1)  # Prevent division by zero
-            mem_percent = (mem_usage / mem_limit) * 100.0 if mem_limit > 0 else 0
-            
-            # Get cache memory if available
-            mem_cache = mem_stats.get('stats', {}).get('cache', 0)
-            
-            # Get swap memory if available
-            mem_swap = mem_stats.get('stats', {}).get('swap', 0)
-            
-            # Memory failures (OOM)
-            oom_kills = mem_stats.get('stats', {}).get('oom_kills', 0)
-            
-            # Process network stats if available
-            network_rx = 0
-            network_tx = 0
-            network_rx_dropped = 0
-            network_tx_dropped = 0
-            network_rx_errors = 0
-            network_tx_errors = 0
-            
-            if 'networks' in stats:
-                for interface, data in stats['networks'].items():
-                    network_rx += data.get('rx_bytes', 0)
-                    network_tx += data.get('tx_bytes', 0)
-                    network_rx_dropped += data.get('rx_dropped', 0)
-                    network_tx_dropped += data.get('tx_dropped', 0)
-                    network_rx_errors += data.get('rx_errors', 0)
-                    network_tx_errors += data.get('tx_errors', 0)
-            
-            # Process block I/O stats if available
-            block_read = 0
-            block_write = 0
-            io_time = 0
-            io_wait_time = 0
-            
-            blkio_stats = stats.get('blkio_stats', {})
-            
-            # Read/write bytes
-            if 'io_service_bytes_recursive' in blkio_stats and blkio_stats['io_service_bytes_recursive'] is not None:
-                for entry in blkio_stats['io_service_bytes_recursive']:
-                    if entry.get('op') == 'Read':
-                        block_read += entry.get('value', 0)
-                    elif entry.get('op') == 'Write':
-                        block_write += entry.get('value', 0)
-            
-            # Service time
-            if 'io_service_time_recursive' in blkio_stats and blkio_stats['io_service_time_recursive'] is not None:
-                for entry in blkio_stats['io_service_time_recursive']:
-                    io_time += entry.get('value', 0)
-            
-            # Wait time
-            if 'io_wait_time_recursive' in blkio_stats and blkio_stats['io_wait_time_recursive'] is not None:
-                for entry in blkio_stats['io_wait_time_recursive']:
-                    io_wait_time += entry.get('value', 0)
+            # Read straight from cgroupfs when the container's cgroup is visible on this host
+            stats = self._read_cgroup_stats(container_id)
+            if stats is not None:
+                return stats
             
-            # Get PIDs
-            pids = stats.get('pids_stats', {}).get('current', 0)
+            # Use the latest frame from the background stream while it is current; a stalled
+            # stream falls through to a one-off snapshot instead of repeating old numbers
+            frame = self._current_stream_frame(container_id)
+            if frame is not None:
+                stats = orjson.loads(frame)
+                return self._process_stats(container_id, stats.get('name', container_id).lstrip('/'), 'running', stats)
             
-            return {
-                'id': container_id,
-                'name': container.name,
-                'status': container.status,
-                'running': True,
-                
-                # CPU metrics
-                'cpu_percent': round(cpu_percent, 2),
-                'cpu_throttled_periods': cpu_throttled_periods,
-                'cpu_throttled_time': cpu_throttled_time,
-                'cpu_system_percent': round((system_delta / online_cpus) * 100.0, 2) if system_delta > 0 and online_cpus > 0 else 0,
-                
-                # Memory metrics
-                'mem_usage': round(mem_usage / (1024 * 1024), 2),  # MB
-                'mem_limit': round(mem_limit / (1024 * 1024), 2),  # MB
-                'mem_percent': round(mem_percent, 2),
-                'mem_cache': round(mem_cache / (1024 * 1024), 2) if mem_cache else 0,  # MB
-                'mem_swap': round(mem_swap / (1024 * 1024), 2) if mem_swap else 0,  # MB
-                'oom_kills': oom_kills,
-                
-                # Network metrics
-                'network_rx': network_rx,
-                'network_tx': network_tx,
-                'network_rx_dropped': network_rx_dropped,
-                'network_tx_dropped': network_tx_dropped,
-                'network_rx_errors': network_rx_errors,
-                'network_tx_errors': network_tx_errors,
-                
-                # Block I/O metrics
-                'block_read': block_read,
-                'block_write': block_write,
-                'io_time': io_time,
-                'io_wait_time': io_wait_time,
+            # Containers listed as running this refresh need no extra lookup
+            name = self._container_names.get(container_id)
+            if name is None:
+                container = self.client.containers.get(container_id)
                 
-                # Process metrics
-                'pids': pids,
+                # Skip if container is not running
+                if container.status != "running":
+                    return {
+                        'id': container_id,
+                        'name': container.name,
+                        'status': container.status,
+                        'running': False,
+                        'timestamp': time.time()
+                    }
+                name = container.name
+            
+            # Get a single stats snapshot; one-shot returns at once instead of sampling for a second
+            if self._one_shot:
+                stats = self._one_shot_stats(container_id)
+                prev_cpu = self._prev_cpu.get(container_id)
+                self._prev_cpu[container_id] = stats['cpu_stats']
                 
-                'timestamp': time.time()
-            }
-        except Exception as e:
-            print(f"Error getting stats for container {container_id}: {e}")
+                # CPU usage is measured against the previous snapshot, zero on the first one
+                stats['precpu_stats'] = prev_cpu if prev_cpu is not None else stats['cpu_stats']
+            else:
+                stats = self.client.api.stats(container_id, stream=False)
+            return self._process_stats(container_id, name, 'running', stats)
+        except DOCKER_ERRORS as e:
+            logger.warning("Error getting stats for container %s: %s", container_id, e)
             return {
                 'id': container_id,
                 'name': container_id[:12],  # Use ID as name if we can't get the actual name
@@ -277,38 +316,503 @@ class DockerStats:
                 'timestamp': time.time()
             }
     
-    def get_all_container_stats(self) -> pd.DataFrame:
-        """Get stats for all running containers and return as DataFrame."""
+    def _one_shot_stats(self, container_id: str) -> Dict[str, Any]:
+        """Request a single stats snapshot without the sampling delay, decoded with orjson."""
+        # Same request as api.stats(stream=False, one_shot=True), but its body is parsed here
+        # instead of by docker-py's stdlib JSON decoding
+        api = self.client.api
+        response = api.get(
+            f"{api.base_url}/v{api.api_version}/containers/{container_id}/stats",
+            params={'stream': False, 'one-shot': True},
+            timeout=api.timeout
+        )
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            # Map status codes to docker-py's errors (NotFound for a container that just went away)
+            raise docker.errors.create_api_error_from_http_exception(e) from e
+        return orjson.loads(response.content)
+    
+    def _process_stats(self, container_id: str, name: str, status: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a raw Docker stats frame into the dashboard's metrics dictionary."""
+        # Check if we have valid stats data
+        if not stats or 'cpu_stats' not in stats or 'precpu_stats' not in stats:
+            return {
+                'id': container_id,
+                'name': name,
+                'status': 'unknown',
+                'running': False,
+                'timestamp': time.time()
+            }
+        
+        # Process CPU stats - add safety checks
+        cpu_delta = 0
+        system_delta = 0
+        
+        if 'cpu_usage' in stats['cpu_stats'] and 'cpu_usage' in stats['precpu_stats'] and \
+           'total_usage' in stats['cpu_stats']['cpu_usage'] and 'total_usage' in stats['precpu_stats']['cpu_usage']:
+            cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - stats['precpu_stats']['cpu_usage']['total_usage']
+        
+        if 'system_cpu_usage' in stats['cpu_stats'] and 'system_cpu_usage' in stats['precpu_stats']:
+            system_delta = stats['cpu_stats']['system_cpu_usage'] - stats['precpu_stats']['system_cpu_usage']
+        
+        online_cpus = stats['cpu_stats'].get('online_cpus') or self._online_cpus
+        
+        cpu_percent = 0.0
+        if system_delta > 0 and cpu_delta > 0:
+            cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0
+        
+        # CPU throttling stats
+        cpu_throttled_periods = 0
+        cpu_throttled_time = 0
+        if 'throttling_data' in stats.get('cpu_stats', {}):
+            cpu_throttled_periods = stats['cpu_stats']['throttling_data'].get('throttled_periods', 0)
+            cpu_throttled_time = stats['cpu_stats']['throttling_data'].get('throttled_time', 0)
+        
+        # Process memory stats - add safety checks
+        mem_stats = stats.get('memory_stats', {})
+        
+        # Leave out reclaimable page cache like `docker stats` does
+        # (total_inactive_file on cgroup v1 hosts, inactive_file on v2)
+        mem_detail = mem_stats.get('stats', {})
+        inactive_file = mem_detail.get('total_inactive_file', mem_detail.get('inactive_file', 0))
+        mem_usage = max(mem_stats.get('usage', 0) - inactive_file, 0)
+        mem_limit = mem_stats.get('limit', 0)
+        
+        # Get cache memory if available
+        mem_cache = mem_stats.get('stats', {}).get('cache', 0)
+        
+        # Get swap memory if available
+        mem_swap = mem_stats.get('stats', {}).get('swap', 0)
+        
+        # Memory failures (OOM)
+        oom_kills = mem_stats.get('stats', {}).get('oom_kills', 0)
+        
+        # Process network stats if available, summing each counter across interfaces
+        interfaces = [
+            (data.get('rx_bytes', 0), data.get('tx_bytes', 0),
+             data.get('rx_dropped', 0), data.get('tx_dropped', 0),
+             data.get('rx_errors', 0), data.get('tx_errors', 0))
+            for data in (stats.get('networks') or {}).values()
+        ]
+        (network_rx, network_tx,
+         network_rx_dropped, network_tx_dropped,
+         network_rx_errors, network_tx_errors) = [sum(counter) for counter in zip(*interfaces)] if interfaces else (0,) * 6
+        
+        # Process block I/O stats if available
+        blkio_stats = stats.get('blkio_stats', {})
+        
+        # Read/write bytes in one pass, bucketed by op; the daemon sends null instead of empty lists
+        block_io = [0, 0]
+        for entry in blkio_stats.get('io_service_bytes_recursive') or ():
+            index = BLKIO_OPS.get(entry['op'])
+            if index is not None:
+                block_io[index] += entry['value']
+        block_read, block_write = block_io
+        
+        # Service and wait time
+        io_time = sum(entry['value'] for entry in blkio_stats.get('io_service_time_recursive') or ())
+        io_wait_time = sum(entry['value'] for entry in blkio_stats.get('io_wait_time_recursive') or ())
+        
+        # Get PIDs
+        pids = stats.get('pids_stats', {}).get('current', 0)
+        
+        return {
+            'id': container_id,
+            'name': name,
+            'status': status,
+            'running': True,
+            
+            # CPU metrics
+            'cpu_percent': cpu_percent,
+            'cpu_throttled_periods': cpu_throttled_periods,
+            'cpu_throttled_time': cpu_throttled_time,
+            'cpu_system_percent': (system_delta / online_cpus) * 100.0 if system_delta > 0 and online_cpus > 0 else 0,
+            
+            # Memory metrics, in bytes; _finish_columns converts them to MB
+            'mem_usage': mem_usage,
+            'mem_limit': mem_limit,
+            'mem_cache': mem_cache,
+            'mem_swap': mem_swap,
+            'oom_kills': oom_kills,
+            
+            # Network metrics
+            'network_rx': network_rx,
+            'network_tx': network_tx,
+            'network_rx_dropped': network_rx_dropped,
+            'network_tx_dropped': network_tx_dropped,
+            'network_rx_errors': network_rx_errors,
+            'network_tx_errors': network_tx_errors,
+            
+            # Block I/O metrics
+            'block_read': block_read,
+            'block_write': block_write,
+            'io_time': io_time,
+            'io_wait_time': io_wait_time,
+            
+            # Process metrics
+            'pids': pids,
+            
+            'timestamp': time.time()
+        }
+    
+    def get_all_container_stats(self, containers: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+        """Get stats for all running containers and return as DataFrame.
+        
+        Pass the result of get_containers() as `containers` to avoid listing them again.
+        """
         if not self.is_connected:
             return pd.DataFrame()
         
-        all_stats = []
-        containers = self.get_containers()
+        if containers is None:
+            containers = self.get_containers(running_only=True)
+        
+        # Only get stats for running containers
+        running = [container for container in containers if container['status'] == 'running']
+        self._container_names = {container['id']: container['name'] for container in running}
         
-        for container in containers:
-            # Only get stats for running containers
-            if container['status'] == 'running':
-                stats = self.get_container_stats(container['id'])
-                if stats:
-                    all_stats.append(stats)
+        # Forget cgroup and CPU state of containers that are gone
+        for container_id in set(self._cgroup_dirs) - set(self._container_names):
+            cgroup_dir = self._cgroup_dirs.pop(container_id, None)
+            self._cgroup_prev.pop(container_id, None)
+            self._close_net_dev(container_id)
+            if cgroup_dir is not None:
+                self._close_cgroup_files(cgroup_dir)
+        
+        for container_id in set(self._prev_cpu) - set(self._container_names):
+            del self._prev_cpu[container_id]
+        
+        # Keep a stats stream open for containers we can't read from cgroupfs
+        self._sync_streams([container['id'] for container in running if self._cgroup_dir(container['id']) is None])
+        
+        # Local reads (cgroupfs, current stream frames) are instant, so only containers that need
+        # a daemon round-trip each are collected concurrently
+        container_ids = [container['id'] for container in running]
+        remote_ids = [container_id for container_id in container_ids if not self._has_local_stats(container_id)]
+        results = {
+            container_id: self._collect_container_stats(container_id)
+            for container_id in container_ids if container_id not in remote_ids
+        }
+        results.update(zip(remote_ids, self._executor.map(self._collect_container_stats, remote_ids)))
+        
+        all_stats = [results[container_id] for container_id in container_ids if results[container_id]]
         
         if not all_stats:
             return pd.DataFrame()
         
-        return pd.DataFrame(all_stats)
+        # Gather values column by column so pandas doesn't have to transpose row dicts
+        columns: Dict[str, List[Any]] = {}
+        for i, stats in enumerate(all_stats):
+            for key, value in stats.items():
+                columns.setdefault(key, [None] * len(all_stats))[i] = value
+        
+        # Convert memory and round CPU for all containers at once
+        self._finish_columns(columns)
+        
+        # Build known columns straight into their schema dtype instead of inferring and then casting;
+        # bare arrays rather than Series, so the constructor has no per-column index to align
+        df = pd.DataFrame({
+            key: pd.array(values, dtype=STATS_DTYPES[key]) if key in STATS_DTYPES else values
+            for key, values in columns.items()
+        })
+        
+        # Total the summary columns from the collected values, so the dashboard doesn't reduce the frame again
+        df.attrs['totals'] = {
+            key: np.nansum(np.asarray(columns[key], dtype=np.float64)) if key in columns else 0
+            for key in TOTAL_COLUMNS
+        }
+        
+        # pandas copies attrs onto filtered frames too, so record which rows the totals cover
+        df.attrs['totals_index'] = df.index
+        return df
     
-    def get_container_logs(self, container_id: str, lines: int = 50) -> List[str]:
-        """Get the most recent logs from a container."""
+    @classmethod
+    def _finish_columns(cls, columns: Dict[str, Any]):
+        """Turn collected stats columns into their reported units, as whole-column operations."""
+        # Memory arrives in bytes; convert it to MB and derive usage percentages
+        if 'mem_usage' in columns:
+            cls._derive_memory_columns(columns)
+        
+        # Round the CPU percentages per column rather than per container as they are collected
+        for key in CPU_COLUMNS:
+            if key in columns:
+                columns[key] = np.round(np.array(columns[key], dtype=np.float64), 2)
+    
+    @staticmethod
+    def _derive_memory_columns(columns: Dict[str, Any]):
+        """Replace the byte-valued memory columns with MB and add mem_percent, as whole-column operations."""
+        # All memory columns as one 2-D block, so each step is a single array operation;
+        # errored containers have None here, which becomes NaN
+        memory = np.array([columns[key] for key in MEMORY_COLUMNS], dtype=np.float64)
+        mem_usage, mem_limit = memory[0], memory[1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mem_percent = mem_usage / mem_limit * 100.0
+        mem_percent[mem_limit == 0] = 0.0
+        
+        derived = np.round(np.vstack((memory / (1024 * 1024), mem_percent)), 2)
+        columns.update(zip(MEMORY_COLUMNS + ('mem_percent',), derived))
+    
+    def _current_stream_frame(self, container_id: str) -> Optional[bytes]:
+        """Return the container's latest raw streamed stats frame, or None if there is none or it is stale."""
+        received = self._streams.get(container_id)
+        if received is None or time.monotonic() - received[0] >= STREAM_STALE_SECONDS:
+            return None
+        return received[1]
+    
+    def _has_local_stats(self, container_id: str) -> bool:
+        """Whether a container's stats can be had without a daemon request."""
+        return self._cgroup_dir(container_id) is not None or self._current_stream_frame(container_id) is not None
+    
+    def _sync_streams(self, container_ids: List[str]):
+        """Start stats streams for new containers and stop those no longer running."""
+        for container_id in set(self._stream_threads) - set(container_ids):
+            self._stop_stream(container_id)
+        
+        for container_id in container_ids:
+            if container_id not in self._stream_threads:
+                stop = threading.Event()
+                thread = threading.Thread(
+                    target=self._read_stream,
+                    args=(container_id, stop),
+                    name=f"stats-{container_id}",
+                    daemon=True
+                )
+                with self._stream_lock:
+                    self._stream_stops[container_id] = stop
+                    self._stream_threads[container_id] = thread
+                thread.start()
+    
+    def _stop_stream(self, container_id: str, timeout: float = 0.1, stop: Optional[threading.Event] = None):
+        """Signal a container's stream reader to stop and drop its latest frame.
+        
+        Given `stop`, only that reader's stream is stopped, not one started after it for the same container.
+        """
+        with self._stream_lock:
+            if stop is not None and self._stream_stops.get(container_id) is not stop:
+                return
+            stop = self._stream_stops.pop(container_id, None)
+            thread = self._stream_threads.pop(container_id, None)
+            self._streams.pop(container_id, None)
+            if stop is not None:
+                stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+    
+    def _read_stream(self, container_id: str, stop: threading.Event):
+        """Background reader keeping the latest stats frame for one container."""
+        try:
+            # Frames arrive as newline-terminated JSON; split them ourselves and keep the newest
+            # complete one undecoded, it is only parsed (with orjson) if a refresh reads it
+            pending = b''
+            for chunk in self.client.api.stats(container_id, stream=True, decode=False):
+                if stop.is_set():
+                    return
+                *lines, pending = (pending + chunk).split(b'\n')
+                frame = next((line for line in reversed(lines) if line.strip()), None)
+                if frame is not None:
+                    # Publish under the lock _stop_stream holds, so a frame can't land after the
+                    # stream was stopped, where nothing would remove it again
+                    with self._stream_lock:
+                        if stop.is_set():
+                            return
+                        self._streams[container_id] = (time.monotonic(), frame)
+        except Exception as e:
+            # Catch everything here: an escaping error would only kill this thread with a traceback
+            logger.info("Stats stream for container %s closed: %s", container_id, e)
+        
+        # Stream ended on its own (container stopped), forget it so it can be restarted
+        self._stop_stream(container_id, stop=stop)
+    
+    def _cgroup_dir(self, container_id: str) -> Optional[str]:
+        """Find a container's cgroup v2 directory, or None if it isn't visible from here."""
+        if container_id not in self._cgroup_dirs:
+            matches = []
+            if self._cgroup_v2:
+                # systemd cgroup driver first, then the cgroupfs driver layout
+                for pattern in ('system.slice/docker-{}*.scope', 'docker/{}*'):
+                    matches = glob.glob(os.path.join(CGROUP_ROOT, pattern.format(container_id)))
+                    if matches:
+                        break
+            self._cgroup_dirs[container_id] = matches[0] if matches else None
+        return self._cgroup_dirs[container_id]
+    
+    def _read_cgroup_file(self, cgroup_dir: str, name: str) -> str:
+        """Read one cgroup interface (or procfs) file through a descriptor kept open between reads."""
+        path = os.path.join(cgroup_dir, name)
+        fd = self._cgroup_fds.get(path)
+        if fd is None:
+            fd = self._cgroup_fds[path] = os.open(path, os.O_RDONLY)
+        
+        # pread from offset 0 regenerates the file contents in a single syscall
+        try:
+            chunks = [os.pread(fd, 65536, 0)]
+            while len(chunks[-1]) == 65536:
+                chunks.append(os.pread(fd, 65536, 65536 * len(chunks)))
+        except OSError:
+            self._cgroup_fds.pop(path, None)
+            os.close(fd)
+            raise
+        return b''.join(chunks).decode()
+    
+    def _close_cgroup_files(self, cgroup_dir: str):
+        """Close the descriptors held open for a container's cgroup files."""
+        prefix = cgroup_dir + os.sep
+        for path in [path for path in self._cgroup_fds if path.startswith(prefix)]:
+            os.close(self._cgroup_fds.pop(path))
+    
+    def _close_net_dev(self, container_id: str):
+        """Close the network counters file held open for a container."""
+        proc_dir = self._net_dev_dirs.pop(container_id, None)
+        if proc_dir is not None:
+            self._close_cgroup_files(proc_dir)
+    
+    def _read_cgroup_keyed(self, cgroup_dir: str, name: str) -> Dict[str, int]:
+        """Read a flat-keyed cgroup file such as cpu.stat into a dictionary."""
+        values = {}
+        for line in self._read_cgroup_file(cgroup_dir, name).splitlines():
+            key, _, value = line.partition(' ')
+            values[key] = int(value)
+        return values
+    
+    def _read_cgroup_stats(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Read container metrics directly from cgroupfs, or None when not available."""
+        cgroup_dir = self._cgroup_dir(container_id)
+        if cgroup_dir is None:
+            return None
+        
+        try:
+            now = time.monotonic()  # CPU shares are measured against elapsed time, not the wall clock
+            cpu_stat = self._read_cgroup_keyed(cgroup_dir, 'cpu.stat')
+            memory_stat = self._read_cgroup_keyed(cgroup_dir, 'memory.stat')
+            memory_events = self._read_cgroup_keyed(cgroup_dir, 'memory.events')
+            mem_usage = int(self._read_cgroup_file(cgroup_dir, 'memory.current'))
+            mem_max = self._read_cgroup_file(cgroup_dir, 'memory.max').strip()
+            io_stat = self._read_cgroup_file(cgroup_dir, 'io.stat')
+            pids = int(self._read_cgroup_file(cgroup_dir, 'pids.current'))
+            procs = self._read_cgroup_file(cgroup_dir, 'cgroup.procs').split()
+        except OSError:
+            # Container went away or a controller isn't enabled, use the API from now on
+            self._close_cgroup_files(cgroup_dir)
+            self._close_net_dev(container_id)
+            self._cgroup_dirs[container_id] = None
+            return None
+        
+        # Leave out reclaimable page cache like `docker stats` does
+        mem_usage = max(mem_usage - memory_stat.get('inactive_file', 0), 0)
+        
+        # Swap accounting is optional
+        try:
+            mem_swap = int(self._read_cgroup_file(cgroup_dir, 'memory.swap.current'))
+        except OSError:
+            mem_swap = 0
+        
+        # CPU usage as the share of wall time since the previous read
+        usage_usec = cpu_stat.get('usage_usec', 0)
+        system_usec = cpu_stat.get('system_usec', 0)
+        prev = self._cgroup_prev.get(container_id)
+        self._cgroup_prev[container_id] = (usage_usec, system_usec, now)
+        
+        cpu_percent = 0.0
+        cpu_system_percent = 0.0
+        if prev is not None and now > prev[2]:
+            elapsed_usec = (now - prev[2]) * 1e6
+            cpu_percent = (usage_usec - prev[0]) / elapsed_usec * 100.0
+            cpu_system_percent = (system_usec - prev[1]) / elapsed_usec * 100.0
+        
+        # Unlimited containers are bounded by host memory
+        if mem_max == 'max':
+            mem_limit = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+        else:
+            mem_limit = int(mem_max)
+        mem_cache = memory_stat.get('file', 0)
+        
+        # Block I/O, summed over devices ("MAJ:MIN rbytes=N wbytes=N ...")
+        block_read = 0
+        block_write = 0
+        for line in io_stat.splitlines():
+            for field in line.split()[1:]:
+                key, _, value = field.partition('=')
+                if key == 'rbytes':
+                    block_read += int(value)
+                elif key == 'wbytes':
+                    block_write += int(value)
+        
+        # Network counters live in the container's network namespace, read via one of its processes
+        lines = []
+        if procs:
+            # Keep net/dev open like the cgroup files, reopening if the process we read through changed
+            proc_dir = f"/proc/{procs[0]}"
+            previous_dir = self._net_dev_dirs.get(container_id)
+            if previous_dir is not None and previous_dir != proc_dir:
+                self._close_cgroup_files(previous_dir)
+            self._net_dev_dirs[container_id] = proc_dir
+            
+            try:
+                lines = self._read_cgroup_file(proc_dir, 'net/dev').splitlines()[2:]  # Skip the two header lines
+            except OSError:
+                pass  # Process exited between reads
+        
+        # Sum each counter across interfaces other than loopback, as for the API's networks section
+        interfaces = [
+            NET_DEV_COUNTERS(data.split())
+            for interface, _, data in (line.partition(':') for line in lines)
+            if interface.strip() != 'lo'
+        ]
+        (network_rx, network_tx,
+         network_rx_dropped, network_tx_dropped,
+         network_rx_errors, network_tx_errors) = [sum(map(int, counter)) for counter in zip(*interfaces)] if interfaces else (0,) * 6
+        
+        return {
+            'id': container_id,
+            'name': self._container_names.get(container_id, container_id),
+            'status': 'running',
+            'running': True,
+            
+            # CPU metrics
+            'cpu_percent': cpu_percent,
+            'cpu_throttled_periods': cpu_stat.get('nr_throttled', 0),
+            'cpu_throttled_time': cpu_stat.get('throttled_usec', 0) * 1000,  # ns, as reported by the API
+            'cpu_system_percent': cpu_system_percent,
+            
+            # Memory metrics, in bytes; _finish_columns converts them to MB
+            'mem_usage': mem_usage,
+            'mem_limit': mem_limit,
+            'mem_cache': mem_cache,
+            'mem_swap': mem_swap,
+            'oom_kills': memory_events.get('oom_kill', 0),
+            
+            # Network metrics
+            'network_rx': network_rx,
+            'network_tx': network_tx,
+            'network_rx_dropped': network_rx_dropped,
+            'network_tx_dropped': network_tx_dropped,
+            'network_rx_errors': network_rx_errors,
+            'network_tx_errors': network_tx_errors,
+            
+            # Block I/O metrics (cgroup v2 has no service/wait time counters)
+            'block_read': block_read,
+            'block_write': block_write,
+            'io_time': 0,
+            'io_wait_time': 0,
+            
+            # Process metrics
+            'pids': pids,
+            
+            'timestamp': time.time()
+        }
+    
+    def get_container_logs(self, container_id: str, lines: int = 50) -> str:
+        """Get the most recent logs from a container as one newline-separated string."""
         if not self.is_connected:
-            return []
+            return ""
         
         try:
             container = self.client.containers.get(container_id)
-            logs = container.logs(tail=lines, timestamps=True).decode('utf-8').splitlines()
-            return logs
-        except Exception as e:
-            print(f"Error getting logs for container {container_id}: {e}")
-            return []
+            return container.logs(tail=lines, timestamps=True).decode('utf-8')
+        except DOCKER_ERRORS as e:
+            logger.warning("Error getting logs for container %s: %s", container_id, e)
+            return ""
     
     def get_container_events(self, container_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent events for a specific container."""
@@ -316,21 +820,26 @@ class DockerStats:
             return []
         
         try:
-            # Get system events filtered by this container
-            events = []
-            for event in self.client.events(decode=True, filters={'container': container_id}):
-                events.append({
+            # Bound the event stream at now so it replays the daemon's recent events and ends,
+            # instead of waiting for new ones; keep only the newest `limit` of them
+            stream = self.client.events(decode=True, until=int(time.time()), filters={'container': container_id})
+            try:
+                recent = collections.deque(stream, maxlen=limit)
+            finally:
+                stream.close()
+            
+            return [
+                {
                     'time': event['time'],
                     'type': event['Type'],
                     'action': event['Action'],
                     'id': event['Actor']['ID'][:12],
                     'attributes': event['Actor'].get('Attributes', {})
-                })
-                if len(events) >= limit:
-                    break
-            return events
-        except Exception as e:
-            print(f"Error getting events for container {container_id}: {e}")
+                }
+                for event in recent
+            ]
+        except DOCKER_ERRORS as e:
+            logger.warning("Error getting events for container %s: %s", container_id, e)
             return []
     
     def get_system_stats(self) -> Dict[str, Any]:
@@ -338,6 +847,11 @@ class DockerStats:
         if not self.is_connected:
             return {}
         
+        # Reuse a recent snapshot, info and disk usage are slow daemon calls that change rarely
+        cached_at, system_stats = self._system_stats
+        if system_stats and time.monotonic() - cached_at < SYSTEM_STATS_TTL:
+            return system_stats
+        
         try:
             # Get Docker info
             info = self.client.info()
@@ -346,10 +860,10 @@ class DockerStats:
             usage = self.client.df()
             
             # Calculate total image and container sizes
-            total_image_size = sum(image['Size'] for image in usage.get('Images', []))
-            total_container_size = sum(container['SizeRw'] for container in usage.get('Containers', []) if 'SizeRw' in container)
+            total_image_size = int(np.fromiter((image['Size'] for image in usage.get('Images', [])), dtype=np.int64).sum())
+            total_container_size = int(np.fromiter((container.get('SizeRw', 0) for container in usage.get('Containers', [])), dtype=np.int64).sum())
             
-            return {
+            system_stats = {
                 'containers_running': info.get('ContainersRunning', 0),
                 'containers_paused': info.get('ContainersPaused', 0),
                 'containers_stopped': info.get('ContainersStopped', 0),
@@ -362,8 +876,10 @@ class DockerStats:
                 'total_image_size': total_image_size / (1024 * 1024 * 1024),  # GB
                 'total_container_size': total_container_size / (1024 * 1024 * 1024),  # GB
             }
-        except Exception as e:
-            print(f"Error getting system stats: {e}")
+            self._system_stats = (time.monotonic(), system_stats)
+            return system_stats
+        except DOCKER_ERRORS as e:
+            logger.warning("Error getting system stats: %s", e)
             return {}
     
     def test_docker_connection(self) -> bool:
@@ -371,11 +887,17 @@ class DockerStats:
         if not self.is_connected:
             return False
         
+        # A recent successful ping is good enough; failures are retried on the next call
+        if self._last_ping is not None and time.monotonic() - self._last_ping < PING_TTL:
+            return True
+        
         try:
             self.client.ping()
-            return True
-        except:
+        except DOCKER_ERRORS:
+            self._last_ping = None
             return False
+        self._last_ping = time.monotonic()
+        return True
 
 # For testing the module directly
 if __name__ == "__main__":